@@ -2,29 +2,50 @@
 API endpoints for the Educational Tool Chatbot
 """
 
-from fastapi import HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
-from typing import List
-from datetime import datetime
+from fastapi import BackgroundTasks, HTTPException, Request
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response
+import asyncio
+import hashlib
 import logging
+import time
+import orjson
 
 from models.schemas import (
     QueryRequest, 
-    ToolRecommendation, 
     ChatResponse, 
-    HealthResponse,
-    UserPreferencesRequest
+    UserPreferencesRequest,
+    TOOLS_ADAPTER
 )
 from services.intent_classifier import IntentResult
 from core.components import get_components
+from core.config import settings
+from core.timestamps import now_iso
 
 logger = logging.getLogger(__name__)
 
-def get_root_endpoint():
+# Web interface page, read once at startup by load_index_html()
+INDEX_HTML_PATH = "templates/index.html"
+_index_html = b""
+_index_etag = ""
+_INDEX_CACHE_CONTROL = "public, max-age=3600"
+
+def load_index_html(path: str = INDEX_HTML_PATH):
+    """Read the web interface into memory so GET / never touches the filesystem"""
+    global _index_html, _index_etag
+    with open(path, "rb") as f:
+        _index_html = f.read()
+    _index_etag = f'"{hashlib.sha256(_index_html).hexdigest()[:16]}"'
+
+def get_root_endpoint(request: Request):
     """Serve a simple HTML interface for testing"""
-    with open("templates/index.html", "r") as f:
-        html_content = f.read()
-    return HTMLResponse(content=html_content)
+    if not _index_html:
+        # Not cached: stream from disk (sendfile where available) with ETag/Last-Modified headers
+        return FileResponse(INDEX_HTML_PATH, media_type="text/html")
+    
+    headers = {"ETag": _index_etag, "Cache-Control": _INDEX_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == _index_etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=_index_html, headers=headers)
 
 def get_chat_instructions():
     """Get chat endpoint usage instructions"""
@@ -53,283 +74,261 @@ def get_chat_instructions():
         "tip": "💡 Use the web interface at http://localhost:8000 for easy testing!"
     }
 
-async def chat_endpoint(request: QueryRequest) -> ChatResponse:
+def recommendation_dict(tool) -> dict:
+    """Recommendation entry for a knowledge base tool, with the fields personalization reads"""
+    return {"name": tool["name"], "description": tool["description"], "url": tool["url"], "category": tool["category"]}
+
+async def chat_endpoint(request: QueryRequest, background_tasks: BackgroundTasks) -> ChatResponse:
     """Main chat endpoint that processes user queries and returns tool recommendations"""
     components = get_components()
-    knowledge_base = components["knowledge_base"]
-    intent_classifier = components["intent_classifier"]
-    memory_service = components["memory_service"]
-    analytics_service = components["analytics_service"]
+    knowledge_base = components.knowledge_base
+    intent_classifier = components.intent_classifier
+    memory_service = components.memory_service
+    analytics_service = components.analytics_service
     
     analytics_service.increment_request_count()
     
     try:
-        # Validate input
-        if not request.query.strip():
-            raise HTTPException(status_code=400, detail="Query cannot be empty")
-        
         # Generate user ID if not provided
-        user_id = request.user_id or f"anonymous_{request.timestamp or int(datetime.now().timestamp())}"
+        user_id = request.user_id or f"anonymous_{request.timestamp or time.time_ns()}"
         
         # Log the request with timestamp for debugging
-        timestamp_info = f" (timestamp: {request.timestamp})" if request.timestamp else ""
-        logger.info(f"Processing query for user {user_id}: {request.query[:100]}...{timestamp_info}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processing query for user %s: %.100s... (timestamp: %s)", user_id, request.query, request.timestamp)
         
-        # Get user context from memory
-        user_context = None
+        # Fetch user context from memory on a worker thread while the query is prepared
+        context_task = None
         if memory_service:
+            context_task = asyncio.create_task(
+                asyncio.to_thread(memory_service.get_user_context, user_id, request.query)
+            )
+        cleaned_query = intent_classifier.prepare_query(request.query)
+        
+        user_context = None
+        if context_task:
             try:
-                user_context = memory_service.get_user_context(user_id, request.query)
-                logger.info(f"Retrieved context for user {user_id}: {user_context.get('has_context', False)}")
+                user_context = await context_task
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Retrieved context for user %s: %s", user_id, user_context.get('has_context', False))
             except Exception as e:
-                logger.warning(f"Failed to retrieve user context: {e}")
+                logger.warning("Failed to retrieve user context: %s", e)
         
         # Classify intent and get recommendations (with context)
-        intent_result: IntentResult = intent_classifier.classify_intent(request.query, user_context)
+        intent_result: IntentResult = await asyncio.to_thread(
+            intent_classifier.classify_intent, request.query, user_context, cleaned_query=cleaned_query
+        )
         
-        # Convert tools to response format
-        recommendations = []
-        for tool in intent_result.primary_tools:
-            recommendations.append(ToolRecommendation(
-                name=tool["name"],
-                description=tool["description"],
-                url=tool["url"]
-            ))
+        # Recommendations are internal-only, so keep them as plain dicts
+        recommendations = [recommendation_dict(tool) for tool in intent_result.primary_tools]
         
         # Personalize recommendations based on user history
         if memory_service and user_context and user_context.get('has_context'):
             try:
-                personalized_recommendations = memory_service.get_personalized_recommendations(
-                    user_id, request.query, [tool.model_dump() for tool in recommendations]
+                personalized_recommendations = await asyncio.to_thread(
+                    memory_service.get_personalized_recommendations, user_id, request.query, recommendations
                 )
-                # Update recommendations with personalization
-                for i, rec in enumerate(recommendations):
-                    if i < len(personalized_recommendations):
-                        if personalized_recommendations[i].get("personalization_reasons"):
-                            rec.description += f" (Personalized: {', '.join(personalized_recommendations[i]['personalization_reasons'])})"
+                # Update recommendations with personalization; the personalized list is re-sorted by
+                # score, so reasons are matched to each tool by name rather than by position
+                reasons_by_name = {
+                    rec["name"]: rec.get("personalization_reasons")
+                    for rec in personalized_recommendations
+                }
+                for rec in recommendations:
+                    reasons = reasons_by_name.get(rec["name"])
+                    if reasons:
+                        rec["description"] += f" (Personalized: {', '.join(reasons)})"
             except Exception as e:
-                logger.warning(f"Failed to personalize recommendations: {e}")
+                logger.warning("Failed to personalize recommendations: %s", e)
         
         analytics_service.increment_successful_queries()
         
         response = ChatResponse(
             response_text=intent_result.suggested_response,
-            timestamp=datetime.now().isoformat()
+            timestamp=now_iso()
         )
         
-        # Store interaction in memory
+        # Store interaction in memory after the response has been sent
         if memory_service:
-            try:
-                memory_service.store_interaction(
-                    user_id=user_id,
-                    query=request.query,
-                    response={
-                        "query_type": intent_result.query_type,
-                        "confidence_score": intent_result.confidence_score,
-                        "recommendations": [tool.model_dump() for tool in recommendations],
-                        "reasoning": intent_result.reasoning
-                    },
-                    context={"user_context": user_context}
-                )
-                logger.info(f"Stored interaction for user {user_id}")
-            except Exception as e:
-                logger.warning(f"Failed to store interaction: {e}")
+            background_tasks.add_task(
+                memory_service.store_interaction,
+                user_id=user_id,
+                query=request.query,
+                response={
+                    "query_type": intent_result.query_type,
+                    "confidence_score": intent_result.confidence_score,
+                    "recommendations": recommendations,
+                    "reasoning": intent_result.reasoning
+                },
+                context={"user_context": user_context}
+            )
         
-        # Add cache-busting headers
-        return JSONResponse(
-            content=response.model_dump(),
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
-        )
+        # POST responses are not cached by browsers or proxies, so no cache-busting headers are needed
+        return ORJSONResponse(content=response.model_dump())
         
+    except HTTPException:
+        analytics_service.increment_failed_queries()
+        raise
     except Exception as e:
         analytics_service.increment_failed_queries()
-        logger.error(f"Error processing query: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        logger.exception("Error processing query")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {e}")
 
-async def get_all_tools() -> List[ToolRecommendation]:
-    """Get all available educational tools"""
-    components = get_components()
-    knowledge_base = components["knowledge_base"]
+# Catalog responses, serialized once at startup by load_catalog_responses()
+_all_tools_json = b"[]"
+_categories_json = b"{}"
+_tools_by_category_json = {}
+
+def _serialize_tools(tools) -> bytes:
+    """Serialize knowledge base tools as a ToolRecommendation list"""
+    return TOOLS_ADAPTER.dump_json(TOOLS_ADAPTER.validate_python(list(tools)))
+
+def load_catalog_responses(knowledge_base):
+    """Pre-serialize the static tool catalog endpoints"""
+    global _all_tools_json, _categories_json, _tools_by_category_json
     
-    try:
-        all_tools = knowledge_base.get_all_tools()
-        tools_list = []
-        
-        for tool_data in all_tools.values():
-            tools_list.append(ToolRecommendation(
-                name=tool_data["name"],
-                description=tool_data["description"],
-                url=tool_data["url"],
-                category=tool_data["category"],
-                keywords=tool_data["keywords"],
-                use_cases=tool_data["use_cases"]
-            ))
-        
-        return tools_list
-        
-    except Exception as e:
-        logger.error(f"Error getting tools: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving tools: {str(e)}")
+    all_tools = knowledge_base.get_all_tools()
+    _all_tools_json = _serialize_tools(all_tools.values())
+    
+    category_counts = {}
+    tools_by_category = {}
+    for category in knowledge_base.get_categories():
+        tools = knowledge_base.get_tools_by_category(category)
+        category_counts[category] = len(tools)
+        tools_by_category[category] = _serialize_tools(tools)
+    
+    _categories_json = orjson.dumps({
+        "categories": category_counts,
+        "total_tools": len(all_tools)
+    })
+    _tools_by_category_json = tools_by_category
+
+async def get_all_tools() -> Response:
+    """Get all available educational tools"""
+    # The body is one shared bytes object, so there is nothing to gain from streaming it
+    return Response(content=_all_tools_json, media_type="application/json")
 
-async def get_categories():
+async def get_categories() -> Response:
     """Get all available tool categories"""
-    components = get_components()
-    knowledge_base = components["knowledge_base"]
-    
-    try:
-        categories = knowledge_base.get_categories()
-        category_counts = {}
-        
-        for category in categories:
-            tools = knowledge_base.get_tools_by_category(category)
-            category_counts[category] = len(tools)
-        
-        return {
-            "categories": category_counts,
-            "total_tools": len(knowledge_base.get_all_tools())
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting categories: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving categories: {str(e)}")
+    return Response(content=_categories_json, media_type="application/json")
 
-async def get_tools_by_category(category: str) -> List[ToolRecommendation]:
+async def get_tools_by_category(category: str) -> Response:
     """Get tools by specific category"""
-    components = get_components()
-    knowledge_base = components["knowledge_base"]
+    tools_json = _tools_by_category_json.get(category)
+    if tools_json is None:
+        raise HTTPException(status_code=404, detail=f"No tools found for category: {category}")
     
-    try:
-        tools = knowledge_base.get_tools_by_category(category)
-        if not tools:
-            raise HTTPException(status_code=404, detail=f"No tools found for category: {category}")
-        
-        tools_list = []
-        for tool_data in tools:
-            tools_list.append(ToolRecommendation(
-                name=tool_data["name"],
-                description=tool_data["description"],
-                url=tool_data["url"],
-                category=tool_data["category"],
-                keywords=tool_data["keywords"],
-                use_cases=tool_data["use_cases"]
-            ))
-        
-        return tools_list
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting tools by category: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving tools: {str(e)}")
+    return Response(content=tools_json, media_type="application/json")
 
-async def health_check() -> HealthResponse:
-    """Health check endpoint"""
-    import os
+# Health response body on either side of the timestamp, built by load_health_status()
+_health_prefix = b""
+_health_suffix = b""
+
+def load_health_status():
+    """Pre-serialize the health status, components and API key are fixed after startup"""
+    global _health_prefix, _health_suffix
     components = get_components()
-    knowledge_base = components["knowledge_base"]
-    intent_classifier = components["intent_classifier"]
-    memory_service = components["memory_service"]
     
     components_status = {
-        "knowledge_base": "healthy" if knowledge_base else "unhealthy",
-        "intent_classifier": "healthy" if intent_classifier else "unhealthy",
-        "memory_service": "healthy" if memory_service else "unhealthy",
-        "openai_api": "healthy" if os.getenv("OPENAI_API_KEY") else "unhealthy"
+        "knowledge_base": "healthy" if components.knowledge_base else "unhealthy",
+        "intent_classifier": "healthy" if components.intent_classifier else "unhealthy",
+        "memory_service": "healthy" if components.memory_service else "unhealthy",
+        "openai_api": "healthy" if settings.OPENAI_API_KEY else "unhealthy"
     }
     
     overall_status = "healthy" if all(status == "healthy" for status in components_status.values()) else "unhealthy"
     
-    return HealthResponse(
-        status=overall_status,
-        timestamp=datetime.now().isoformat(),
-        components=components_status
+    # Same shape as HealthResponse: {"status": ..., "timestamp": ..., "components": {...}}
+    _health_prefix = orjson.dumps({"status": overall_status})[:-1] + b',"timestamp":"'
+    _health_suffix = b'","components":' + orjson.dumps(components_status) + b'}'
+
+async def health_check() -> Response:
+    """Health check endpoint"""
+    return Response(
+        content=_health_prefix + now_iso().encode() + _health_suffix,
+        media_type="application/json"
     )
 
 async def get_analytics():
     """Get basic analytics about API usage"""
     components = get_components()
-    knowledge_base = components["knowledge_base"]
-    memory_service = components["memory_service"]
-    analytics_service = components["analytics_service"]
+    knowledge_base = components.knowledge_base
+    memory_service = components.memory_service
+    analytics_service = components.analytics_service
     
     return analytics_service.get_analytics(knowledge_base, memory_service)
 
 async def get_user_insights(user_id: str):
     """Get insights about a user's teaching patterns"""
     components = get_components()
-    memory_service = components["memory_service"]
+    memory_service = components.memory_service
     
     if not memory_service:
         raise HTTPException(status_code=503, detail="Memory service not available")
     
     try:
-        insights = memory_service.get_user_insights(user_id)
+        insights = await asyncio.to_thread(memory_service.get_user_insights, user_id)
         return {
             "user_id": user_id,
             "insights": insights,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     except Exception as e:
-        logger.error(f"Error getting user insights: {e}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving insights: {str(e)}")
+        logger.exception("Error getting user insights")
+        raise HTTPException(status_code=500, detail=f"Error retrieving insights: {e}")
 
 async def get_user_context_endpoint(user_id: str, query: str = ""):
     """Get user context for a specific query"""
     components = get_components()
-    memory_service = components["memory_service"]
+    memory_service = components.memory_service
     
     if not memory_service:
         raise HTTPException(status_code=503, detail="Memory service not available")
     
     try:
-        context = memory_service.get_user_context(user_id, query)
+        context = await asyncio.to_thread(memory_service.get_user_context, user_id, query)
         return {
             "user_id": user_id,
             "query": query,
             "context": context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     except Exception as e:
-        logger.error(f"Error getting user context: {e}")
-        raise HTTPException(status_code=500, detail=f"Error retrieving context: {str(e)}")
+        logger.exception("Error getting user context")
+        raise HTTPException(status_code=500, detail=f"Error retrieving context: {e}")
 
 async def clear_user_memory(user_id: str):
     """Clear all memory for a specific user"""
     components = get_components()
-    memory_service = components["memory_service"]
+    memory_service = components.memory_service
     
     if not memory_service:
         raise HTTPException(status_code=503, detail="Memory service not available")
     
     try:
-        memory_service.clear_user_memory(user_id)
+        await asyncio.to_thread(memory_service.clear_user_memory, user_id)
         return {
             "message": f"Memory cleared for user {user_id}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     except Exception as e:
-        logger.error(f"Error clearing user memory: {e}")
-        raise HTTPException(status_code=500, detail=f"Error clearing memory: {str(e)}")
+        logger.exception("Error clearing user memory")
+        raise HTTPException(status_code=500, detail=f"Error clearing memory: {e}")
 
 async def update_user_preferences(user_id: str, request: UserPreferencesRequest):
     """Update user preferences"""
     components = get_components()
-    memory_service = components["memory_service"]
+    memory_service = components.memory_service
     
     if not memory_service:
         raise HTTPException(status_code=503, detail="Memory service not available")
     
     try:
-        memory_service.update_user_preferences(user_id, request.preferences)
+        await asyncio.to_thread(memory_service.update_user_preferences, user_id, request.preferences)
         return {
             "message": f"Preferences updated for user {user_id}",
             "preferences": request.preferences,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
     except Exception as e:
-        logger.error(f"Error updating user preferences: {e}")
-        raise HTTPException(status_code=500, detail=f"Error updating preferences: {str(e)}") 
\ No newline at end of file
+        logger.exception("Error updating user preferences")
+        raise HTTPException(status_code=500, detail=f"Error updating preferences: {e}") 
\ No newline at end of file
@@ -2,25 +2,30 @@
 Component management for the Educational Tool Chatbot
 """
 
-# Global variables for components
-knowledge_base = None
-intent_classifier = None
-memory_service = None
-analytics_service = None
+from dataclasses import dataclass
+from typing import Any
 
-def get_components():
+@dataclass(slots=True, frozen=True)
+class Components:
+    """Initialized application components shared by every request"""
+    knowledge_base: Any = None
+    intent_classifier: Any = None
+    memory_service: Any = None
+    analytics_service: Any = None
+
+# Replaced once by set_components during startup
+_components = Components()
+
+def get_components() -> Components:
     """Get initialized components"""
-    return {
-        "knowledge_base": knowledge_base,
-        "intent_classifier": intent_classifier,
-        "memory_service": memory_service,
-        "analytics_service": analytics_service
-    }
+    return _components
 
 def set_components(kb, ic, ms, as_service):
     """Set the initialized components"""
-    global knowledge_base, intent_classifier, memory_service, analytics_service
-    knowledge_base = kb
-    intent_classifier = ic
-    memory_service = ms
-    analytics_service = as_service 
\ No newline at end of file
+    global _components
+    _components = Components(
+        knowledge_base=kb,
+        intent_classifier=ic,
+        memory_service=ms,
+        analytics_service=as_service
+    )
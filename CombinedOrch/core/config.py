@@ -5,12 +5,44 @@ Core configuration for the Educational Tool Chatbot API
 import os
 from dotenv import load_dotenv
 import logging
+import orjson
+from uvicorn.config import LOG_LEVELS
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+class JSONLogFormatter(logging.Formatter):
+    """Formats each log record as a single JSON line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+# Spellings logging accepts that uvicorn's log_level does not
+_LOG_LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+
+def _read_log_level() -> str:
+    """LOG_LEVEL as one of uvicorn's level names, upper-cased, so logging and uvicorn agree"""
+    level = os.getenv("LOG_LEVEL", "WARNING").strip().upper()
+    level = _LOG_LEVEL_ALIASES.get(level, level)
+    if level.lower() not in LOG_LEVELS:
+        raise ValueError(f"LOG_LEVEL must be one of {', '.join(name.upper() for name in LOG_LEVELS)}, got {level!r}")
+    return level
+
+LOG_LEVEL = _read_log_level()
+
+# Configure logging: WARNING unless LOG_LEVEL says otherwise, LOG_FORMAT=json for structured output
+_log_handler = logging.StreamHandler()
+if os.getenv("LOG_FORMAT", "text").lower() == "json":
+    _log_handler.setFormatter(JSONLogFormatter())
+logging.basicConfig(level=LOG_LEVELS[LOG_LEVEL.lower()], handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
 class Settings:
@@ -24,6 +56,13 @@ class Settings:
     # Server Configuration
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "8000"))
+    WORKERS = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+    RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+    # Threads per worker for blocking OpenAI/mem0 calls
+    THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "64"))
+    
+    # Logging, already normalized to a name both logging and uvicorn accept
+    LOG_LEVEL = LOG_LEVEL
     
     # API Keys
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -34,6 +73,12 @@ class Settings:
     CORS_METHODS = ["*"]
     CORS_HEADERS = ["*"]
     
+    # Serve templates/index.html from memory; disable to pick up template edits without a restart
+    CACHE_INDEX_HTML = os.getenv("CACHE_INDEX_HTML", "true").lower() == "true"
+    
+    # Response compression
+    GZIP_MINIMUM_SIZE = 1024
+    
     @classmethod
     def validate_settings(cls):
         """Validate required settings"""
@@ -0,0 +1,9 @@
+"""
+Timestamp helpers for the Educational Tool Chatbot
+"""
+
+from datetime import datetime, timezone
+
+def now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (no local timezone lookup)"""
+    return datetime.now(timezone.utc).isoformat()
@@ -3,7 +3,7 @@ Exception handlers for the Educational Tool Chatbot API
 """
 
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 
@@ -12,7 +12,7 @@ logger = logging.getLogger(__name__)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions with custom error responses"""
     if exc.status_code == 404:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=404,
             content={
                 "error": "Endpoint not found",
@@ -30,7 +30,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             }
         )
     elif exc.status_code == 405:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=405,
             content={
                 "error": "Method not allowed",
@@ -44,15 +44,15 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             }
         )
     else:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={"error": exc.detail}
         )
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -0,0 +1,11 @@
+"""
+Gunicorn configuration for the Educational Tool Chatbot
+Runs the FastAPI app with multiple Uvicorn workers: gunicorn main:app
+"""
+
+from core.config import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = settings.WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 60
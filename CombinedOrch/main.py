@@ -4,16 +4,20 @@ Uses organized architecture with separated concerns
 """
 
 import os
+import asyncio
 import uvicorn
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from fastapi import FastAPI
+from fastapi import BackgroundTasks, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 
 from core.config import settings
 from core.components import set_components
-from services.knowledge_base import EducationalToolKnowledgeBase
+from services.knowledge_base import knowledge_base
 from services.intent_classifier import IntentClassifier
 from services.memory_service import EducationalMemoryService
 from services.analytics import AnalyticsService
@@ -27,6 +31,9 @@ from models.schemas import (
     UserPreferencesRequest
 )
 from api.endpoints import (
+    load_index_html,
+    load_catalog_responses,
+    load_health_status,
     get_root_endpoint,
     get_chat_instructions,
     chat_endpoint,
@@ -50,8 +57,12 @@ async def lifespan(app: FastAPI):
     # Validate settings
     settings.validate_settings()
     
-    # Initialize components
-    knowledge_base = EducationalToolKnowledgeBase()
+    # Size the pool used by asyncio.to_thread for blocking OpenAI/mem0 calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.THREAD_POOL_SIZE)
+    )
+    
+    # Initialize components (the knowledge base is a shared module-level instance)
     intent_classifier = IntentClassifier(settings.OPENAI_API_KEY)
     memory_service = EducationalMemoryService(settings.OPENAI_API_KEY)
     analytics_service = AnalyticsService()
@@ -59,12 +70,19 @@ async def lifespan(app: FastAPI):
     # Set components in the components module
     set_components(knowledge_base, intent_classifier, memory_service, analytics_service)
     
+    # Cache the web interface page and static catalog/health responses
+    if settings.CACHE_INDEX_HTML:
+        load_index_html()
+    load_catalog_responses(knowledge_base)
+    load_health_status()
+    
     logger.info("Educational Tool Chatbot with Memory started successfully")
     
     yield
     
-    # Shutdown (cleanup if needed)
+    # Shutdown: let queued memory writes reach mem0 before exiting
     logger.info("Educational Tool Chatbot shutting down")
+    await asyncio.to_thread(memory_service.close)
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application"""
@@ -72,6 +90,7 @@ def create_app() -> FastAPI:
         title=settings.TITLE,
         description=settings.DESCRIPTION,
         version=settings.VERSION,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan
     )
     
@@ -84,6 +103,9 @@ def create_app() -> FastAPI:
         allow_headers=settings.CORS_HEADERS,
     )
     
+    # Compress larger responses such as the tool listings
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+    
     # Add exception handlers
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     app.add_exception_handler(Exception, general_exception_handler)
@@ -96,10 +118,12 @@ def create_app() -> FastAPI:
 app = create_app()
 
 # API Endpoints
-@app.get("/")
-async def root():
+async def root(request: Request):
     """Serve a simple HTML interface for testing"""
-    return get_root_endpoint()
+    return get_root_endpoint(request)
+
+# Plain Starlette route: the static page needs no dependency resolution or validation
+app.add_route("/", root, methods=["GET"])
 
 @app.get("/chat")
 async def chat_instructions():
@@ -107,9 +131,9 @@ async def chat_instructions():
     return get_chat_instructions()
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: QueryRequest):
+async def chat(request: QueryRequest, background_tasks: BackgroundTasks):
     """Main chat endpoint that processes user queries and returns tool recommendations"""
-    return await chat_endpoint(request)
+    return await chat_endpoint(request, background_tasks)
 
 @app.get("/tools", response_model=List[ToolRecommendation])
 async def get_tools():
@@ -162,6 +186,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=True,
-        log_level="info"
+        loop="uvloop",
+        http="httptools",
+        # uvicorn ignores workers when reload is enabled
+        workers=1 if settings.RELOAD else settings.WORKERS,
+        reload=settings.RELOAD,
+        log_level=settings.LOG_LEVEL.lower()
     ) 
\ No newline at end of file
@@ -2,28 +2,45 @@
 Pydantic models for the Educational Tool Chatbot API
 """
 
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, StringConstraints, TypeAdapter
+from typing import Annotated, List, Dict, Any, Optional
+
+# Shared model settings: drop unknown fields and skip re-validating defaults
+_MODEL_CONFIG = ConfigDict(extra='ignore', str_strip_whitespace=False, validate_default=False)
 
 class QueryRequest(BaseModel):
-    query: str
+    model_config = _MODEL_CONFIG
+    
+    # Blank queries are rejected with a 422 before the endpoint runs
+    query: Annotated[str, StringConstraints(min_length=1, strip_whitespace=True)]
     context: Optional[str] = None
     user_id: Optional[str] = None
     timestamp: Optional[int] = None
 
 class ToolRecommendation(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     name: str
     description: str
     url: str
 
 class ChatResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     response_text: str
     timestamp: str
 
 class HealthResponse(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     status: str
     timestamp: str
     components: Dict[str, str]
 
 class UserPreferencesRequest(BaseModel):
-    preferences: Dict[str, Any] 
\ No newline at end of file
+    model_config = _MODEL_CONFIG
+    
+    preferences: Dict[str, Any]
+
+# Validates/serializes tool lists in one pass instead of per element
+TOOLS_ADAPTER = TypeAdapter(List[ToolRecommendation]) 
\ No newline at end of file
@@ -2,27 +2,55 @@
 Analytics service for the Educational Tool Chatbot API
 """
 
+from array import array
 from typing import Dict, Any
 
+# Slots in the counter buffer
+_REQUESTS = 0
+_SUCCESSFUL = 1
+_FAILED = 2
+
 class AnalyticsService:
     """Service for managing API analytics and request counting"""
     
     def __init__(self):
-        self.request_count = 0
-        self.successful_queries = 0
-        self.failed_queries = 0
+        # Unsigned 64-bit counters kept in one typed buffer
+        self._counts = array('Q', [0, 0, 0])
+        # Tool/category counts, filled on first use since the catalog is static
+        self._catalog_stats = None
+    
+    @property
+    def request_count(self) -> int:
+        return self._counts[_REQUESTS]
+    
+    @property
+    def successful_queries(self) -> int:
+        return self._counts[_SUCCESSFUL]
+    
+    @property
+    def failed_queries(self) -> int:
+        return self._counts[_FAILED]
     
     def increment_request_count(self):
         """Increment the total request count"""
-        self.request_count += 1
+        self._counts[_REQUESTS] += 1
     
     def increment_successful_queries(self):
         """Increment successful queries count"""
-        self.successful_queries += 1
+        self._counts[_SUCCESSFUL] += 1
     
     def increment_failed_queries(self):
         """Increment failed queries count"""
-        self.failed_queries += 1
+        self._counts[_FAILED] += 1
+    
+    def _get_catalog_stats(self, knowledge_base) -> Dict[str, int]:
+        """Get tool and category counts, computed once per process"""
+        if self._catalog_stats is None:
+            self._catalog_stats = {
+                "total_tools": len(knowledge_base.get_all_tools()),
+                "categories": len(knowledge_base.get_categories())
+            }
+        return self._catalog_stats
     
     def get_analytics(self, knowledge_base, memory_service) -> Dict[str, Any]:
         """Get analytics data"""
@@ -33,18 +61,19 @@ class AnalyticsService:
             except Exception as e:
                 memory_stats = {"error": str(e)}
         
+        request_count, successful_queries, failed_queries = self._counts
+        catalog_stats = self._get_catalog_stats(knowledge_base)
+        
         return {
-            "total_requests": self.request_count,
-            "successful_queries": self.successful_queries,
-            "failed_queries": self.failed_queries,
-            "success_rate": (self.successful_queries / self.request_count * 100) if self.request_count > 0 else 0,
-            "total_tools": len(knowledge_base.get_all_tools()),
-            "categories": len(knowledge_base.get_categories()),
+            "total_requests": request_count,
+            "successful_queries": successful_queries,
+            "failed_queries": failed_queries,
+            "success_rate": (successful_queries / request_count * 100) if request_count > 0 else 0,
+            "total_tools": catalog_stats["total_tools"],
+            "categories": catalog_stats["categories"],
             "memory_service": memory_stats
         }
     
     def reset_analytics(self):
         """Reset all analytics counters"""
-        self.request_count = 0
-        self.successful_queries = 0
-        self.failed_queries = 0 
\ No newline at end of file
+        self._counts = array('Q', [0, 0, 0]) 
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Embedding Batcher for Educational Tool Chatbot
+Coalesces embedding requests from concurrent classifications into shared API calls
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+
+class _PendingText:
+    """A text waiting to be embedded, and the slot its caller waits on"""
+    
+    __slots__ = ("text", "vector", "leader", "done")
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.vector: Optional[np.ndarray] = None
+        self.leader = False
+        self.done = threading.Event()
+
+
+class EmbeddingBatcher:
+    """Sends at most one embedding request at a time, batching whatever arrived meanwhile"""
+    
+    def __init__(self, embed_batch: Callable[[List[str]], Optional[np.ndarray]], max_batch: int = 16):
+        """Wrap a function mapping a list of texts to one row per text (or None on failure)"""
+        self.embed_batch = embed_batch
+        self.max_batch = max_batch
+        
+        self._pending: List[_PendingText] = []
+        self._busy = False
+        self._lock = threading.Lock()
+    
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a single text, sharing the API call with other threads embedding concurrently"""
+        item = _PendingText(text)
+        with self._lock:
+            self._pending.append(item)
+            lead = not self._busy
+            self._busy = True
+        
+        # An idle batcher sends straight away; otherwise wait to be served or handed the next batch
+        if not lead:
+            item.done.wait()
+            if not item.leader:
+                return item.vector
+        
+        self._send_next_batch()
+        return item.vector
+    
+    def _send_next_batch(self):
+        """Embed the oldest pending texts, then pass the lead to a waiting thread if any remain"""
+        with self._lock:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+        
+        vectors = None
+        try:
+            vectors = self.embed_batch([item.text for item in batch])
+        finally:
+            # Waiters must always be released, even if the embedding call raised
+            for i, item in enumerate(batch):
+                item.vector = None if vectors is None else vectors[i]
+                item.done.set()
+            
+            with self._lock:
+                if self._pending:
+                    successor = self._pending[0]
+                    successor.leader = True
+                    successor.done.set()
+                else:
+                    self._busy = False
@@ -5,19 +5,168 @@ Integrates with mem0 to store user interactions and provide contextual recommend
 
 import os
 from mem0 import MemoryClient
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-import json
+from typing import Dict, List, Optional, Any, Tuple
 import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
+from operator import itemgetter
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Phrases that make a query worth remembering, grouped by the store reason they signal
+MEMORY_INDICATORS = {
+    # User preferences and constraints (high value)
+    "user_preferences": (
+        "i prefer", "i like", "i don't like", "i hate", "i avoid",
+        "i always", "i never", "my students", "my class", "my teaching style",
+        "i teach", "grade level", "subject area", "curriculum"
+    ),
+    # Feedback on recommendations (high value)
+    "tool_feedback": (
+        "this worked well", "this didn't work", "perfect", "exactly what i needed",
+        "not helpful", "great suggestion", "love this tool", "hate this tool",
+        "better than", "worse than", "prefer this over"
+    ),
+    # Recurring patterns or specific needs (medium value)
+    "usage_pattern": (
+        "again", "similar to", "like before", "as usual", "typically",
+        "my usual", "my go-to", "i often", "frequently", "regularly"
+    ),
+    # Context that reveals teaching style (medium value)
+    "teaching_style": (
+        "interactive", "hands-on", "visual", "creative", "traditional",
+        "project-based", "collaborative", "individual", "group work",
+        "assessment focused", "creative assignments"
+    ),
+    # Subject-specific or grade-specific information (medium value)
+    "subject_context": (
+        "math", "science", "english", "history", "art", "music",
+        "elementary", "middle school", "high school", "kindergarten",
+        "1st grade", "2nd grade", "3rd grade", "4th grade", "5th grade"
+    ),
+}
+MEMORY_INDICATOR_REASONS = {indicator: reason for reason, indicators in MEMORY_INDICATORS.items() for indicator in indicators}
+MIN_INDICATOR_LENGTH = min(map(len, MEMORY_INDICATOR_REASONS))
+# Zero-width lookahead, so one scan reports every indicator that starts at each position
+_MEMORY_INDICATOR_RE = re.compile(
+    "(?=(" + "|".join(re.escape(indicator) for indicator in sorted(MEMORY_INDICATOR_REASONS, key=len, reverse=True)) + "))"
+)
+
+# Routine queries that are never worth remembering
+GENERIC_QUERIES = frozenset({
+    "hello", "hi", "help", "what can you do", "how are you",
+    "test", "testing", "check", "status", "help me", "what tools do you have",
+    "what tools", "show me tools", "list tools"
+})
+
+# Words that mark the parts of a query kept in the personalization summary
+PREFERENCE_WORDS = ("prefer", "like", "don't like", "avoid", "always", "never")
+TEACHING_CONTEXT_WORDS = ("teach", "grade", "subject", "class", "students")
+FEEDBACK_WORDS = ("worked well", "didn't work", "perfect", "not helpful", "love", "hate")
+SUBJECTS = ("math", "science", "english", "history", "art", "music")
+GRADES = ("elementary", "middle school", "high school", "kindergarten")
+
+# Labelled fields written into stored memories by _extract_personalization_info
+MEMORY_FIELD_LABELS = ("User preference", "Teaching context", "Tool feedback", "Successfully recommended", "Subject focus", "Grade level")
+_MEMORY_FIELD_RE = re.compile("(" + "|".join(map(re.escape, MEMORY_FIELD_LABELS)) + "):")
+
+# Seconds a user's fetched context and insights stay fresh; writes made through this service invalidate it sooner
+MEMORY_CACHE_TTL = 60.0
+# Cached contexts kept per user, least recently used evicted first
+CONTEXT_CACHE_SIZE = 64
+# Personalization entries kept per user by the fallback storage, oldest dropped first
+FALLBACK_MEMORY_SIZE = int(os.getenv("MEMORY_MAX_PER_USER", "50"))
+# Stats reported while mem0 Platform is in use; constant, so built once (callers get a copy)
+MEM0_STATS = {
+    "status": "active",
+    "provider": "mem0",
+    "message": "Memory service is running with mem0 integration"
+}
+# Threads sending interaction memories to mem0 Platform off the request path
+MEMORY_WRITER_THREADS = 2
+
+@dataclass(slots=True, frozen=True)
+class QueryFeatures:
+    """Everything the memory decisions need from a query's text"""
+    store_reasons: Tuple[str, ...]
+    word_count: int
+    # "User preference" / "Teaching context" / "Tool feedback" parts of the memory text
+    text_parts: Tuple[str, ...]
+    subject: Optional[str]
+    grade: Optional[str]
+
+@lru_cache(maxsize=1024)
+def _query_features(query: str) -> QueryFeatures:
+    """Scan a query once for both the store decision and the memory text; repeated queries reuse the result"""
+    query_lower = query.lower()
+    matched_reasons = {MEMORY_INDICATOR_REASONS[match.group(1)] for match in _MEMORY_INDICATOR_RE.finditer(query_lower)}
+    
+    text_parts = []
+    if any(word in query_lower for word in PREFERENCE_WORDS):
+        text_parts.append(f"User preference: {query}")
+    if any(word in query_lower for word in TEACHING_CONTEXT_WORDS):
+        text_parts.append(f"Teaching context: {query}")
+    if any(word in query_lower for word in FEEDBACK_WORDS):
+        text_parts.append(f"Tool feedback: {query}")
+    
+    return QueryFeatures(
+        store_reasons=tuple(reason for reason in MEMORY_INDICATORS if reason in matched_reasons),
+        word_count=len(query.split()),
+        text_parts=tuple(text_parts),
+        subject=next((subject for subject in SUBJECTS if subject in query_lower), None),
+        grade=next((grade for grade in GRADES if grade in query_lower), None)
+    )
+
+def _first_unique(items: List[Any], limit: Optional[int] = None) -> List[Any]:
+    """Distinct items in first-seen order, up to limit"""
+    return list(islice(dict.fromkeys(items), limit))
+
+def _memory_fields(memory_text: str) -> Dict[str, str]:
+    """Label -> text after the label's first occurrence, found in one scan over the memory"""
+    fields = {}
+    for match in _MEMORY_FIELD_RE.finditer(memory_text):
+        label = match.group(1)
+        if label not in fields:
+            # The value stops at the next period, or earlier where the same label repeats
+            start = match.end()
+            end = memory_text.find(".", start)
+            repeat = memory_text.find(match.group(), start, end if end >= 0 else len(memory_text))
+            if repeat >= 0:
+                end = repeat
+            fields[label] = memory_text[start:end if end >= 0 else None].strip()
+    return fields
+
 class EducationalMemoryService:
+    # Fixed attribute set; the fallback_* ones exist only when mem0 Platform is unavailable
+    __slots__ = (
+        "openai_api_key", "memory", "using_platform",
+        "_context_cache", "_insights_cache", "_cache_lock", "_write_executor",
+        "fallback_memory", "_fallback_totals", "_fallback_stats", "_fallback_lock"
+    )
+    
     def __init__(self, openai_api_key: str):
         """Initialize the memory service with mem0 Platform (managed service)"""
         
         self.openai_api_key = openai_api_key
         
+        # user_id -> {normalized query: (fetched at, context)}, shared by the request worker threads
+        self._context_cache: Dict[str, OrderedDict] = {}
+        # user_id -> (computed at, insights)
+        self._insights_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # Interaction writes don't affect the reply, so they run on their own small pool
+        self._write_executor = ThreadPoolExecutor(max_workers=MEMORY_WRITER_THREADS, thread_name_prefix="memory-writer")
+        
         # Initialize mem0 Platform client
         try:
             mem0_api_key = os.getenv("MEM0_API_KEY")
@@ -29,85 +178,43 @@ class EducationalMemoryService:
             self.using_platform = True
             logger.info("Memory service initialized successfully with mem0 Platform")
         except Exception as e:
-            logger.warning(f"Failed to initialize mem0 Platform: {e}")
+            logger.warning("Failed to initialize mem0 Platform: %s", e)
             # Fallback to a simple in-memory dictionary for basic functionality
             self.memory = None
             self.using_platform = False
-            self.fallback_memory = {}
+            # Bounded per-user history, so appends never need trimming
+            self.fallback_memory = defaultdict(partial(deque, maxlen=FALLBACK_MEMORY_SIZE))
+            # (users, entries) kept up to date by the writers instead of recounted; replaced as a
+            # whole under the lock, so readers get a consistent pair from one attribute load
+            self._fallback_totals = (0, 0)
+            # (totals, stats dict) from the last get_memory_stats
+            self._fallback_stats = None
+            self._fallback_lock = threading.Lock()
             logger.info("Using fallback memory storage")
     
     def _should_store_memory(self, user_id: str, query: str, response: Dict[str, Any], 
                             context: Optional[Dict[str, Any]] = None) -> tuple[bool, str]:
         """Determine if this interaction should be stored in memory"""
         
-        # Criteria for storing memory
-        store_reasons = []
-        
-        # 1. User preferences and constraints (high value)
-        preference_indicators = [
-            "i prefer", "i like", "i don't like", "i hate", "i avoid",
-            "i always", "i never", "my students", "my class", "my teaching style",
-            "i teach", "grade level", "subject area", "curriculum"
-        ]
-        
-        if any(indicator in query.lower() for indicator in preference_indicators):
-            store_reasons.append("user_preferences")
-        
-        # 2. Feedback on recommendations (high value)
-        feedback_indicators = [
-            "this worked well", "this didn't work", "perfect", "exactly what i needed",
-            "not helpful", "great suggestion", "love this tool", "hate this tool",
-            "better than", "worse than", "prefer this over"
-        ]
-        
-        if any(indicator in query.lower() for indicator in feedback_indicators):
-            store_reasons.append("tool_feedback")
-        
-        # 3. Recurring patterns or specific needs (medium value)
-        pattern_indicators = [
-            "again", "similar to", "like before", "as usual", "typically",
-            "my usual", "my go-to", "i often", "frequently", "regularly"
-        ]
-        
-        if any(indicator in query.lower() for indicator in pattern_indicators):
-            store_reasons.append("usage_pattern")
-        
-        # 4. Context that reveals teaching style (medium value)
-        style_indicators = [
-            "interactive", "hands-on", "visual", "creative", "traditional",
-            "project-based", "collaborative", "individual", "group work",
-            "assessment focused", "creative assignments"
-        ]
-        
-        if any(indicator in query.lower() for indicator in style_indicators):
-            store_reasons.append("teaching_style")
-        
-        # 5. Subject-specific or grade-specific information (medium value)
-        subject_indicators = [
-            "math", "science", "english", "history", "art", "music",
-            "elementary", "middle school", "high school", "kindergarten",
-            "1st grade", "2nd grade", "3rd grade", "4th grade", "5th grade"
-        ]
-        
-        if any(indicator in query.lower() for indicator in subject_indicators):
-            store_reasons.append("subject_context")
+        # Skip generic/routine queries first, before any scanning
+        query_key = query.strip().lower()
+        if query_key in GENERIC_QUERIES:
+            return False, "generic_query"
         
-        # 6. Skip generic/routine queries first
-        generic_queries = [
-            "hello", "hi", "help", "what can you do", "how are you",
-            "test", "testing", "check", "status", "help me", "what tools do you have",
-            "what tools", "show me tools", "list tools"
-        ]
+        # Nothing shorter than the shortest indicator can carry context
+        if len(query_key) < MIN_INDICATOR_LENGTH:
+            return False, "too_short"
         
-        if query.lower().strip() in generic_queries:
-            return False, "generic_query"
+        # Criteria for storing memory; they depend only on the text, so repeated queries reuse them
+        features = _query_features(query)
+        store_reasons = list(features.store_reasons)
         
-        # 7. Skip very short queries without context
-        if len(query.split()) < 3 and not store_reasons:
+        # Skip very short queries without context
+        if features.word_count < 3 and not store_reasons:
             return False, "too_short"
         
-        # 8. Low confidence responses (store to learn from) - only if not generic
-        if response.get("confidence_score", 1.0) < 0.7 and len(query.split()) >= 5:
+        # Low confidence responses (store to learn from) - only if not generic
+        if response.get("confidence_score", 1.0) < 0.7 and features.word_count >= 5:
             store_reasons.append("low_confidence")
         
         # Decision logic
@@ -120,20 +227,11 @@ class EducationalMemoryService:
                                     context: Optional[Dict[str, Any]] = None) -> str:
         """Extract the key personalization information from an interaction"""
         
-        # Focus on information that helps with future personalization
-        personalization_parts = []
-        
-        # Extract user preferences and constraints
-        if any(word in query.lower() for word in ["prefer", "like", "don't like", "avoid", "always", "never"]):
-            personalization_parts.append(f"User preference: {query}")
+        # Focus on information that helps with future personalization; the text parts come from the same cached scan
+        features = _query_features(query)
         
-        # Extract teaching context
-        if any(word in query.lower() for word in ["teach", "grade", "subject", "class", "students"]):
-            personalization_parts.append(f"Teaching context: {query}")
-        
-        # Extract tool feedback
-        if any(word in query.lower() for word in ["worked well", "didn't work", "perfect", "not helpful", "love", "hate"]):
-            personalization_parts.append(f"Tool feedback: {query}")
+        # User preferences, teaching context and tool feedback
+        personalization_parts = list(features.text_parts)
         
         # Extract successful recommendations for future reference
         if response.get("confidence_score", 0) > 0.8:
@@ -141,19 +239,11 @@ class EducationalMemoryService:
             if recommended_tools:
                 personalization_parts.append(f"Successfully recommended: {', '.join(recommended_tools)} for {response.get('query_type', 'general')} needs")
         
-        # Extract subject/grade information
-        subjects = ["math", "science", "english", "history", "art", "music"]
-        grades = ["elementary", "middle school", "high school", "kindergarten"]
-        
-        for subject in subjects:
-            if subject in query.lower():
-                personalization_parts.append(f"Subject focus: {subject}")
-                break
-        
-        for grade in grades:
-            if grade in query.lower():
-                personalization_parts.append(f"Grade level: {grade}")
-                break
+        # Subject/grade information
+        if features.subject:
+            personalization_parts.append(f"Subject focus: {features.subject}")
+        if features.grade:
+            personalization_parts.append(f"Grade level: {features.grade}")
         
         # If no specific personalization info found, store the essential context
         if not personalization_parts:
@@ -169,7 +259,7 @@ class EducationalMemoryService:
             should_store, reason = self._should_store_memory(user_id, query, response, context)
             
             if not should_store:
-                logger.info(f"Skipping memory storage for user {user_id}: {reason}")
+                logger.info("Skipping memory storage for user %s: %s", user_id, reason)
                 return True
             
             # Create a personalization-focused memory entry
@@ -184,42 +274,92 @@ class EducationalMemoryService:
                     }
                 ]
                 
-                self.memory.add(
-                    messages=messages,
-                    user_id=user_id,
-                    metadata={
-                        "type": "personalization",
-                        "timestamp": datetime.now().isoformat(),
-                        "query_type": response.get("query_type", "unknown"),
-                        "store_reason": reason,
-                        "confidence_score": response.get("confidence_score", 0.0)
-                    }
-                )
+                metadata = {
+                    "type": "personalization",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "query_type": response.get("query_type", "unknown"),
+                    "store_reason": reason,
+                    "confidence_score": response.get("confidence_score", 0.0)
+                }
+                
+                # Queue the mem0 round trip; the writer logs its outcome
+                self._write_executor.submit(self._write_memory, user_id, messages, metadata, reason)
+                return True
             else:
                 # Use fallback storage
-                if user_id not in self.fallback_memory:
-                    self.fallback_memory[user_id] = []
-                self.fallback_memory[user_id].append({
-                    "timestamp": datetime.now().isoformat(),
+                self._append_fallback_memory(user_id, {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                     "personalization_content": personalization_content,
                     "query_type": response.get("query_type", "unknown"),
                     "store_reason": reason,
                     "confidence_score": response.get("confidence_score", 0.0)
                 })
-                
-                # Keep only last 50 personalization entries per user
-                if len(self.fallback_memory[user_id]) > 50:
-                    self.fallback_memory[user_id] = self.fallback_memory[user_id][-50:]
             
-            logger.info(f"Stored personalization memory for user {user_id}: {reason}")
+            self._invalidate_user_cache(user_id)
+            logger.info("Stored personalization memory for user %s: %s", user_id, reason)
             return True
             
         except Exception as e:
-            logger.error(f"Error storing interaction: {e}")
+            logger.error("Error storing interaction: %s", e)
             return False
     
+    def _append_fallback_memory(self, user_id: str, entry: Dict[str, Any]):
+        """Add an entry to a user's fallback history, keeping the interaction count in step"""
+        with self._fallback_lock:
+            memories = self.fallback_memory[user_id]
+            # A full deque drops its oldest entry, so the total only grows below the bound
+            interactions = self._fallback_totals[1] + (len(memories) < FALLBACK_MEMORY_SIZE)
+            memories.append(entry)
+            self._fallback_totals = (len(self.fallback_memory), interactions)
+    
+    def _write_memory(self, user_id: str, messages: List[Dict[str, str]], metadata: Dict[str, Any], reason: str):
+        """Send one personalization memory to mem0 Platform (runs on a writer thread)"""
+        try:
+            self.memory.add(
+                messages=messages,
+                user_id=user_id,
+                metadata=metadata
+            )
+            self._invalidate_user_cache(user_id)
+            logger.info("Stored personalization memory for user %s: %s", user_id, reason)
+        except Exception as e:
+            logger.error("Error storing interaction: %s", e)
+    
+    def close(self):
+        """Wait for queued memory writes to finish"""
+        self._write_executor.shutdown(wait=True)
+    
+    def _invalidate_user_cache(self, user_id: str):
+        """Drop cached reads for a user after their memories change"""
+        with self._cache_lock:
+            self._context_cache.pop(user_id, None)
+            self._insights_cache.pop(user_id, None)
+    
     def get_user_context(self, user_id: str, current_query: str) -> Dict[str, Any]:
         """Retrieve relevant context for a user based on their history"""
+        # Identical queries (retries, and the personalization step repeating the chat lookup) reuse the last search
+        query_key = current_query.strip().lower()
+        now = time.monotonic()
+        with self._cache_lock:
+            user_cache = self._context_cache.get(user_id)
+            cached = user_cache.get(query_key) if user_cache else None
+            if cached and now - cached[0] < MEMORY_CACHE_TTL:
+                user_cache.move_to_end(query_key)
+                return cached[1]
+        
+        context_info, cacheable = self._load_user_context(user_id, current_query)
+        
+        if cacheable:
+            with self._cache_lock:
+                user_cache = self._context_cache.setdefault(user_id, OrderedDict())
+                user_cache[query_key] = (now, context_info)
+                user_cache.move_to_end(query_key)
+                if len(user_cache) > CONTEXT_CACHE_SIZE:
+                    user_cache.popitem(last=False)
+        return context_info
+    
+    def _load_user_context(self, user_id: str, current_query: str) -> Tuple[Dict[str, Any], bool]:
+        """Build a user's context from their memories; the flag is False when the lookup failed and shouldn't be cached"""
         try:
             relevant_memories = []
             
@@ -240,18 +380,18 @@ class EducationalMemoryService:
                         limit=5
                     )
                 except Exception as search_error:
-                    logger.error(f"Error searching mem0 Platform: {search_error}")
-                    relevant_memories = []
+                    logger.error("Error searching mem0 Platform: %s", search_error)
+                    return {"has_context": False, "context": "No previous interactions found"}, False
             else:
                 # Use fallback memory
                 if user_id in self.fallback_memory:
                     # Simple search - just get the last 5 interactions
-                    relevant_memories = self.fallback_memory[user_id][-5:]
+                    relevant_memories = list(islice(reversed(self.fallback_memory[user_id]), 5))[::-1]
                     # Convert to expected format
                     relevant_memories = [{"metadata": memory} for memory in relevant_memories]
             
             if not relevant_memories:
-                return {"has_context": False, "context": "No previous interactions found"}
+                return {"has_context": False, "context": "No previous interactions found"}, True
             
             # Analyze the memories to extract context
             context_info = {
@@ -262,7 +402,7 @@ class EducationalMemoryService:
                 "teaching_patterns": []
             }
             
-            logger.info(f"Retrieved context for user {user_id}: {len(relevant_memories)} memories")
+            logger.info("Retrieved context for user %s: %s memories", user_id, len(relevant_memories))
             
             for memory in relevant_memories:
                 # Handle mem0 Platform response format
@@ -271,40 +411,29 @@ class EducationalMemoryService:
                     memory_text = memory.get("memory", "") if isinstance(memory, dict) else str(memory)
                     
                     # Log the memory content for debugging
-                    logger.debug(f"Processing memory: {memory_text[:100]}...")
-                    
-                    # Extract user preferences
-                    if "User preference:" in memory_text:
-                        pref_text = memory_text.split("User preference:")[1].split(".")[0].strip()
-                        context_info["previous_queries"].append(pref_text)
+                    logger.debug("Processing memory: %.100s...", memory_text)
                     
-                    # Extract teaching context
-                    if "Teaching context:" in memory_text:
-                        context_text = memory_text.split("Teaching context:")[1].split(".")[0].strip()
-                        context_info["previous_queries"].append(context_text)
+                    fields = _memory_fields(memory_text)
                     
-                    # Extract tool feedback
-                    if "Tool feedback:" in memory_text:
-                        feedback_text = memory_text.split("Tool feedback:")[1].split(".")[0].strip()
-                        context_info["previous_queries"].append(feedback_text)
+                    # Extract user preferences, teaching context and tool feedback
+                    for label in ("User preference", "Teaching context", "Tool feedback"):
+                        if label in fields:
+                            context_info["previous_queries"].append(fields[label])
                     
                     # Extract successful recommendations
-                    if "Successfully recommended:" in memory_text:
-                        rec_text = memory_text.split("Successfully recommended:")[1].split(".")[0].strip()
-                        tools = [tool.strip() for tool in rec_text.split("for")[0].split(",")]
+                    if "Successfully recommended" in fields:
+                        tools = [tool.strip() for tool in fields["Successfully recommended"].partition("for")[0].split(",")]
                         context_info["recent_tools"].extend(tools)
                     
                     # Extract subject and grade information
-                    if "Subject focus:" in memory_text:
-                        subject = memory_text.split("Subject focus:")[1].split(".")[0].strip()
-                        context_info["frequent_categories"].append(subject)
+                    if "Subject focus" in fields:
+                        context_info["frequent_categories"].append(fields["Subject focus"])
                     
-                    if "Grade level:" in memory_text:
-                        grade = memory_text.split("Grade level:")[1].split(".")[0].strip()
-                        context_info["frequent_categories"].append(grade)
+                    if "Grade level" in fields:
+                        context_info["frequent_categories"].append(fields["Grade level"])
                     
                     # Also extract general context from the full memory text
-                    if memory_text and not any(pattern in memory_text for pattern in ["User preference:", "Teaching context:", "Tool feedback:", "Successfully recommended:", "Subject focus:", "Grade level:"]):
+                    if memory_text and not fields:
                         # This is a general memory, add it to previous queries
                         context_info["previous_queries"].append(memory_text[:100])
                 else:
@@ -330,15 +459,17 @@ class EducationalMemoryService:
                         if "subject_context" in reason:
                             context_info["teaching_patterns"].append("Subject-specific teacher")
             
-            # Remove duplicates and get top items
-            context_info["frequent_categories"] = list(set(context_info["frequent_categories"]))[:3]
-            context_info["recent_tools"] = list(set(context_info["recent_tools"]))[:5]
+            # Count categories before deduplicating, so the most common one reflects repeats
+            category_counts = Counter(context_info["frequent_categories"])
+            
+            # Remove duplicates and get top items, keeping the order they were found in
+            context_info["frequent_categories"] = _first_unique(context_info["frequent_categories"], 3)
+            context_info["recent_tools"] = _first_unique(context_info["recent_tools"], 5)
             context_info["previous_queries"] = context_info["previous_queries"][:3]
             
             # Generate teaching patterns insight
-            if context_info["frequent_categories"]:
-                most_common = max(set(context_info["frequent_categories"]), 
-                                key=context_info["frequent_categories"].count)
+            if category_counts:
+                most_common = category_counts.most_common(1)[0][0]
                 context_info["teaching_patterns"] = [
                     f"Frequently asks about {most_common.lower()} related topics",
                     f"Has used {len(context_info['recent_tools'])} different tools recently"
@@ -354,67 +485,83 @@ class EducationalMemoryService:
             
             context_info["has_context"] = has_meaningful_content
             
-            logger.info(f"Retrieved context for user {user_id}: {len(relevant_memories)} memories, has_context: {has_meaningful_content}")
-            logger.info(f"Context summary - queries: {len(context_info['previous_queries'])}, categories: {len(context_info['frequent_categories'])}, tools: {len(context_info['recent_tools'])}")
+            logger.info("Retrieved context for user %s: %s memories, has_context: %s", user_id, len(relevant_memories), has_meaningful_content)
+            logger.info("Context summary - queries: %s, categories: %s, tools: %s", len(context_info['previous_queries']), len(context_info['frequent_categories']), len(context_info['recent_tools']))
             
-            return context_info
+            return context_info, True
             
         except Exception as e:
-            logger.error(f"Error retrieving user context: {e}")
-            return {"has_context": False, "context": "Error retrieving context"}
+            logger.error("Error retrieving user context: %s", e)
+            return {"has_context": False, "context": "Error retrieving context"}, False
     
     def get_personalized_recommendations(self, user_id: str, current_query: str, 
                                        base_recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Enhance recommendations based on user history"""
+        """Enhance recommendations (dicts with at least name and category) based on user history"""
         try:
             context = self.get_user_context(user_id, current_query)
             
             if not context.get("has_context"):
                 return base_recommendations
             
-            # Get user's tool usage history
-            recent_tools = context.get("recent_tools", [])
-            frequent_categories = context.get("frequent_categories", [])
+            # Get user's tool usage history, as sets so each tool needs one hash lookup per check
+            recent_tools = frozenset(context.get("recent_tools", ()))
+            frequent_categories = frozenset(context.get("frequent_categories", ()))
             
-            # Score recommendations based on history
-            scored_recommendations = []
+            # Score recommendations based on history; (score, reasons, tool) until sorted
+            scored = []
             
             for tool in base_recommendations:
+                category = tool["category"]
+                used_before = tool["name"] in recent_tools
+                frequent_category = category in frequent_categories
+                
                 score = 1.0  # Base score
+                reasons = []
                 
                 # Boost score if user has used this tool before
-                if tool["name"] in recent_tools:
+                if used_before:
                     score += 0.3
+                    reasons.append("You've used this tool before")
                 
                 # Boost score if it's in user's frequent categories
-                if tool["category"] in frequent_categories:
+                if frequent_category:
                     score += 0.2
+                    reasons.append(f"You frequently work with {category.lower()} tools")
                 
-                # Add personalization reason
-                reasons = []
-                if tool["name"] in recent_tools:
-                    reasons.append("You've used this tool before")
-                if tool["category"] in frequent_categories:
-                    reasons.append(f"You frequently work with {tool['category'].lower()} tools")
-                
-                tool_copy = tool.copy()
-                tool_copy["personalization_score"] = score
-                tool_copy["personalization_reasons"] = reasons
-                
-                scored_recommendations.append(tool_copy)
+                scored.append((score, reasons, tool))
             
-            # Sort by personalization score
-            scored_recommendations.sort(key=lambda x: x["personalization_score"], reverse=True)
+            # Sort by personalization score, then build each output dict once with its personalization fields
+            scored.sort(key=itemgetter(0), reverse=True)
+            scored_recommendations = [
+                {**tool, "personalization_score": score, "personalization_reasons": reasons}
+                for score, reasons, tool in scored
+            ]
             
-            logger.info(f"Personalized {len(scored_recommendations)} recommendations for user {user_id}")
+            logger.info("Personalized %s recommendations for user %s", len(scored_recommendations), user_id)
             return scored_recommendations
             
         except Exception as e:
-            logger.error(f"Error personalizing recommendations: {e}")
+            logger.error("Error personalizing recommendations: %s", e)
             return base_recommendations
     
     def get_user_insights(self, user_id: str) -> Dict[str, Any]:
         """Get insights about user's teaching patterns"""
+        # Insights only change when the memories do, so dashboard refreshes reuse one fetch
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._insights_cache.get(user_id)
+            if cached and now - cached[0] < MEMORY_CACHE_TTL:
+                return cached[1]
+        
+        insights, cacheable = self._load_user_insights(user_id)
+        
+        if cacheable:
+            with self._cache_lock:
+                self._insights_cache[user_id] = (now, insights)
+        return insights
+    
+    def _load_user_insights(self, user_id: str) -> Tuple[Dict[str, Any], bool]:
+        """Analyze all of a user's memories; the flag is False when the fetch failed and shouldn't be cached"""
         try:
             all_memories = []
             
@@ -434,15 +581,15 @@ class EducationalMemoryService:
                         page_size=50
                     )
                 except Exception as get_error:
-                    logger.error(f"Error getting memories from mem0 Platform: {get_error}")
-                    all_memories = []
+                    logger.error("Error getting memories from mem0 Platform: %s", get_error)
+                    return {"total_interactions": 0, "insights": "No interaction history available"}, False
             else:
                 # Use fallback memory
                 if user_id in self.fallback_memory:
                     all_memories = [{"metadata": memory} for memory in self.fallback_memory[user_id]]
             
             if not all_memories:
-                return {"total_interactions": 0, "insights": "No interaction history available"}
+                return {"total_interactions": 0, "insights": "No interaction history available"}, True
             
             insights = {
                 "total_interactions": len(all_memories),
@@ -469,33 +616,32 @@ class EducationalMemoryService:
                     # Platform returns personalization-focused content
                     memory_text = memory.get("memory", "") if isinstance(memory, dict) else str(memory)
                     
+                    fields = _memory_fields(memory_text)
+                    
                     # Extract user preferences
-                    if "User preference:" in memory_text:
-                        pref_text = memory_text.split("User preference:")[1].split(".")[0].strip()
-                        preferences.append(pref_text)
+                    if "User preference" in fields:
+                        preferences.append(fields["User preference"])
                     
                     # Extract successful tool recommendations
-                    if "Successfully recommended:" in memory_text:
-                        rec_text = memory_text.split("Successfully recommended:")[1].split(".")[0].strip()
-                        if " for " in rec_text:
-                            tools_part = rec_text.split(" for ")[0].strip()
-                            category_part = rec_text.split(" for ")[1].replace(" needs", "").strip()
-                            extracted_tools = [tool.strip() for tool in tools_part.split(",")]
-                            tools.extend(extracted_tools)
-                            categories.append(category_part)
+                    tools_part, found, rest = fields.get("Successfully recommended", "").partition(" for ")
+                    if found:
+                        category_part = rest.partition(" for ")[0]
+                        extracted_tools = [tool.strip() for tool in tools_part.strip().split(",")]
+                        tools.extend(extracted_tools)
+                        categories.append(category_part.replace(" needs", "").strip())
                     
                     # Extract subject and grade information
-                    if "Subject focus:" in memory_text:
-                        subject = memory_text.split("Subject focus:")[1].split(".")[0].strip()
-                        subjects.append(subject)
+                    if "Subject focus" in fields:
+                        subjects.append(fields["Subject focus"])
                     
-                    if "Grade level:" in memory_text:
-                        grade = memory_text.split("Grade level:")[1].split(".")[0].strip()
-                        grades.append(grade)
+                    if "Grade level" in fields:
+                        grades.append(fields["Grade level"])
                     
                     # Extract general query types
-                    if "User asked about" in memory_text:
-                        query_type = memory_text.split("User asked about")[1].split("tools")[0].strip()
+                    _, found, rest = memory_text.partition("User asked about")
+                    if found:
+                        # The type runs up to "tools", or to where the phrase repeats
+                        query_type = rest.partition("User asked about")[0].partition("tools")[0].strip()
                         categories.append(query_type)
                 else:
                     # Fallback format with personalization content
@@ -509,26 +655,20 @@ class EducationalMemoryService:
                     
                     # Extract tools from personalization content
                     if "personalization_content" in metadata:
-                        content = metadata["personalization_content"]
-                        if "Successfully recommended:" in content:
-                            rec_text = content.split("Successfully recommended:")[1].split(".")[0].strip()
-                            if " for " in rec_text:
-                                tools_part = rec_text.split(" for ")[0].strip()
-                                extracted_tools = [tool.strip() for tool in tools_part.split(",")]
-                                tools.extend(extracted_tools)
+                        rec_text = _memory_fields(metadata["personalization_content"]).get("Successfully recommended", "")
+                        tools_part, found, _ = rec_text.partition(" for ")
+                        if found:
+                            extracted_tools = [tool.strip() for tool in tools_part.strip().split(",")]
+                            tools.extend(extracted_tools)
             
             # Process categories
             if categories:
-                insights["most_common_category"] = max(set(categories), key=categories.count)
+                insights["most_common_category"] = Counter(categories).most_common(1)[0][0]
             
             # Process tools
             if tools:
-                tool_counts = {}
-                for tool in tools:
-                    if tool:  # Skip empty tools
-                        tool_counts[tool] = tool_counts.get(tool, 0) + 1
-                insights["favorite_tools"] = sorted(tool_counts.items(), 
-                                                  key=lambda x: x[1], reverse=True)[:3]
+                tool_counts = Counter(tool for tool in tools if tool)  # Skip empty tools
+                insights["favorite_tools"] = tool_counts.most_common(3)
             
             # Process user preferences
             if preferences:
@@ -536,10 +676,10 @@ class EducationalMemoryService:
             
             # Process subjects and grades
             if subjects:
-                insights["primary_subject"] = max(set(subjects), key=subjects.count)
+                insights["primary_subject"] = Counter(subjects).most_common(1)[0][0]
             
             if grades:
-                insights["grade_level"] = max(set(grades), key=grades.count)
+                insights["grade_level"] = Counter(grades).most_common(1)[0][0]
             
             # Process personalization focus from store reasons
             focus_areas = []
@@ -554,7 +694,7 @@ class EducationalMemoryService:
                     focus_areas.append("Teaching style adaptation")
             
             if focus_areas:
-                insights["personalization_focus"] = list(set(focus_areas))
+                insights["personalization_focus"] = _first_unique(focus_areas)
             
             # Determine teaching style based on personalization data
             if insights["most_common_category"] == "CONTENT_CREATION":
@@ -570,18 +710,18 @@ class EducationalMemoryService:
             else:
                 insights["teaching_style"] = "Balanced Educator - You use varied approaches"
             
-            return insights
+            return insights, True
             
         except Exception as e:
-            logger.error(f"Error getting user insights: {e}")
-            return {"total_interactions": 0, "insights": "Error retrieving insights"}
+            logger.error("Error getting user insights: %s", e)
+            return {"total_interactions": 0, "insights": "Error retrieving insights"}, False
     
     def update_user_preferences(self, user_id: str, preferences: Dict[str, Any]):
         """Update user preferences in memory"""
         try:
             preference_data = {
                 "type": "preferences",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "preferences": preferences
             }
             
@@ -590,7 +730,7 @@ class EducationalMemoryService:
                 messages = [
                     {
                         "role": "system",
-                        "content": f"User preferences updated: {json.dumps(preferences)}"
+                        "content": f"User preferences updated: {orjson.dumps(preferences).decode()}"
                     }
                 ]
                 
@@ -601,64 +741,63 @@ class EducationalMemoryService:
                 )
             else:
                 # Use fallback memory
-                if user_id not in self.fallback_memory:
-                    self.fallback_memory[user_id] = []
-                self.fallback_memory[user_id].append(preference_data)
+                self._append_fallback_memory(user_id, preference_data)
             
-            logger.info(f"Updated preferences for user {user_id}")
+            self._invalidate_user_cache(user_id)
+            logger.info("Updated preferences for user %s", user_id)
             
         except Exception as e:
-            logger.error(f"Error updating user preferences: {e}")
+            logger.error("Error updating user preferences: %s", e)
     
     def clear_user_memory(self, user_id: str):
         """Clear all memory for a specific user"""
         try:
             if self.memory:
-                # Use mem0 storage
-                all_memories = self.memory.get_all(user_id=user_id)
-                
-                for memory in all_memories:
-                    memory_id = memory.get("id")
-                    if memory_id:
-                        self.memory.delete(memory_id)
+                # Use mem0 storage: one bulk delete instead of listing and deleting each memory
+                self.memory.delete_all(user_id=user_id)
             else:
                 # Use fallback memory
-                if user_id in self.fallback_memory:
-                    del self.fallback_memory[user_id]
+                with self._fallback_lock:
+                    removed = self.fallback_memory.pop(user_id, None)
+                    if removed is not None:
+                        self._fallback_totals = (len(self.fallback_memory), self._fallback_totals[1] - len(removed))
             
-            logger.info(f"Cleared memory for user {user_id}")
+            self._invalidate_user_cache(user_id)
+            logger.info("Cleared memory for user %s", user_id)
             
         except Exception as e:
-            logger.error(f"Error clearing user memory: {e}")
+            logger.error("Error clearing user memory: %s", e)
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get overall memory statistics"""
+        # mem0 stats are a constant, so only the fallback recount needs the error handling;
+        # shared dicts are copied, so one caller's changes never reach the next response
+        if self.memory:
+            return MEM0_STATS.copy()
+        
         try:
-            if self.memory:
-                return {
-                    "status": "active",
-                    "provider": "mem0",
-                    "message": "Memory service is running with mem0 integration"
-                }
-            else:
-                total_users = len(self.fallback_memory)
-                total_interactions = sum(len(memories) for memories in self.fallback_memory.values())
-                return {
+            # One snapshot of the totals, read without taking the writers' lock
+            totals = self._fallback_totals
+            cached = self._fallback_stats
+            if cached is None or cached[0] != totals:
+                total_users, total_interactions = totals
+                cached = self._fallback_stats = (totals, {
                     "status": "active",
                     "provider": "fallback",
                     "total_users": total_users,
                     "total_interactions": total_interactions,
                     "message": "Memory service is running with fallback storage"
-                }
+                })
+            return cached[1].copy()
             
         except Exception as e:
-            logger.error(f"Error getting memory stats: {e}")
-            return {"status": "error", "message": str(e)}
+            # Stringify once for both the log line and the response
+            msg = str(e)
+            logger.error("Error getting memory stats: %s", msg)
+            return {"status": "error", "message": msg}
 
-# Example usage and testing
-if __name__ == "__main__":
-    # This would be used for testing
-    import os
+def _demo():
+    """Store one interaction for a test user and print what the service reads back"""
     from dotenv import load_dotenv
     
     load_dotenv()
@@ -677,6 +816,8 @@ if __name__ == "__main__":
         }
         
         memory_service.store_interaction("test_user", "I need to create a quiz", test_response)
+        # mem0 writes are queued; let this one land before reading it back
+        memory_service.close()
         
         # Test getting context
         context = memory_service.get_user_context("test_user", "I want to make homework")
@@ -690,4 +831,8 @@ if __name__ == "__main__":
         stats = memory_service.get_memory_stats()
         print("Memory stats:", stats)
     else:
-        print("Please set OPENAI_API_KEY environment variable") 
\ No newline at end of file
+        print("Please set OPENAI_API_KEY environment variable")
+
+# Example usage and testing
+if __name__ == "__main__":
+    _demo() 
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Semantic Cache for Educational Tool Chatbot
+Reuses earlier results for queries whose embeddings are close to a previously seen query
+"""
+
+import threading
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+# Stored rows upcast to float32 per step of a lookup, so its scratch memory stays small and fixed
+SCORE_BLOCK_ROWS = 64
+
+
+def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Symmetric int8 quantization: vector ~= quantized * scale"""
+    scale = float(np.abs(vector).max()) / 127 or 1.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+class SemanticCache:
+    """Bounded nearest-neighbour cache over unit-length query embeddings"""
+    
+    def __init__(self, dimensions: int, threshold: float = 0.85, max_entries: int = 1024):
+        """Create an empty cache; entries beyond max_entries evict the least recently used"""
+        self.threshold = threshold
+        self.max_entries = max_entries
+        
+        # Vectors are stored as int8 with a per-vector scale, a quarter of the float32 footprint
+        self._vectors = np.zeros((max_entries, dimensions), dtype=np.int8)
+        self._scales = np.zeros(max_entries, dtype=np.float32)
+        self._values: List[Optional[Any]] = [None] * max_entries
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        # Scratch space for get(), reused under the lock instead of allocated per lookup
+        self._block = np.empty((min(SCORE_BLOCK_ROWS, max_entries), dimensions), dtype=np.float32)
+        self._scores = np.empty(max_entries, dtype=np.float32)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+    
+    def get(self, vector: np.ndarray) -> Optional[Any]:
+        """Return the value stored for the most similar vector, if it clears the threshold"""
+        with self._lock:
+            if not self._size:
+                return None
+            
+            # Vectors are unit length, so the (rescaled) dot product is the cosine similarity;
+            # rows are upcast a block at a time rather than as one full-size float32 copy
+            vector = np.asarray(vector, dtype=np.float32)
+            scores = self._scores[:self._size]
+            for start in range(0, self._size, len(self._block)):
+                stop = min(start + len(self._block), self._size)
+                block = self._block[:stop - start]
+                np.copyto(block, self._vectors[start:stop])
+                np.dot(block, vector, out=scores[start:stop])
+            np.multiply(scores, self._scales[:self._size], out=scores)
+            best = int(scores.argmax())
+            if scores[best] < self.threshold:
+                return None
+            
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._values[best]
+    
+    def put(self, vector: np.ndarray, value: Any):
+        """Store a value for a unit-length vector"""
+        with self._lock:
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(self._last_used.argmin())
+            
+            self._vectors[slot], self._scales[slot] = _quantize(vector)
+            self._values[slot] = value
+            self._clock += 1
+            self._last_used[slot] = self._clock
+    
+    def __len__(self) -> int:
+        return self._size
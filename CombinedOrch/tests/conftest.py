@@ -0,0 +1,14 @@
+"""
+Shared test setup: import the app modules from the project root without external services
+"""
+
+import os
+import sys
+
+# The app imports its packages top-level (services.*, core.*), as when run from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Point OpenAI at a closed port and leave mem0 unset, so tests never reach the network
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ["OPENAI_BASE_URL"] = "http://127.0.0.1:9"
+os.environ.pop("MEM0_API_KEY", None)
@@ -0,0 +1,58 @@
+"""
+Tests for the single-tool fast path of the intent classifier
+"""
+
+import pytest
+
+from services.intent_classifier import IntentClassifier, _clean_query
+from services.knowledge_base import knowledge_base
+
+# Ordinary queries that contain a single generic tool keyword ("work", "situation", "data", ...)
+GENERIC_QUERIES = (
+    "my students seem bored, how can I get them to work together?",
+    "difficult situation with a student",
+    "how can I get more data on my students?",
+    "help with my progress",
+    "I need to check on a problem in my classroom",
+    "what support does my school offer for testing?",
+)
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    """Classifier whose embedding calls are recorded and fail, with OpenAI paused"""
+    classifier = IntentClassifier("sk-test")
+    embedded = []
+    monkeypatch.setattr(classifier, "_embed", lambda text: embedded.append(text))
+    classifier._openai_paused_until = float("inf")
+    classifier.embedded = embedded
+    return classifier
+
+
+@pytest.mark.parametrize("query", GENERIC_QUERIES)
+def test_generic_words_do_not_name_a_tool(query):
+    assert knowledge_base.find_tools_mentioned(_clean_query(query)) == set()
+
+
+@pytest.mark.parametrize("query", GENERIC_QUERIES)
+def test_generic_queries_are_not_short_circuited(classifier, query):
+    """Generic queries go through the embedding path instead of the keyword fast path"""
+    result = classifier.classify_intent(query)
+    
+    assert classifier.embedded
+    assert result.query_type != "SPECIFIC_TOOL"
+
+
+@pytest.mark.parametrize("query, tool_key", (
+    ("Open the Quiz Generator for me", "quiz-generator"),
+    ("use the class goals & milestones agent", "classgoals-milestone-agent"),
+    ("a think-pair-share prompt on fractions", "tpsprompt"),
+    ("exit ticket for today's lesson", "generate-exit-ticket"),
+))
+def test_named_tool_takes_fast_path(classifier, query, tool_key):
+    """A tool name or a phrase only one tool lists routes straight to that tool"""
+    result = classifier.classify_intent(query)
+    
+    assert not classifier.embedded
+    assert result.query_type == "SPECIFIC_TOOL"
+    assert result.primary_tools[0] is knowledge_base.get_tool_by_key(tool_key)
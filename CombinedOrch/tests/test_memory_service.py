@@ -0,0 +1,57 @@
+"""
+Tests for the memory service running on fallback storage
+"""
+
+import pytest
+
+from api.endpoints import recommendation_dict
+from services.knowledge_base import knowledge_base
+from services.memory_service import EducationalMemoryService
+
+
+@pytest.fixture
+def memory_service():
+    service = EducationalMemoryService("sk-test")
+    yield service
+    service.close()
+
+
+def test_personalizes_the_recommendations_chat_builds(memory_service):
+    """Recommendations shaped like chat_endpoint's are scored against the stored history"""
+    quiz = knowledge_base.get_tool_by_key("quiz-generator")
+    poster = knowledge_base.get_tool_by_key("poster-agent")
+    memory_service.store_interaction(
+        "teacher",
+        "I prefer short quizzes for my students",
+        {"query_type": quiz["category"], "confidence_score": 0.9, "recommendations": [recommendation_dict(quiz)]}
+    )
+    
+    base = [recommendation_dict(poster), recommendation_dict(quiz)]
+    personalized = memory_service.get_personalized_recommendations("teacher", "quiz for my students", base)
+    
+    assert personalized is not base
+    assert [rec["name"] for rec in personalized] == [quiz["name"], poster["name"]]
+    assert personalized[0]["personalization_reasons"] == [f"You frequently work with {quiz['category'].lower()} tools"]
+    assert personalized[1]["personalization_reasons"] == []
+
+
+def test_stats_follow_stores_and_clears(memory_service):
+    memory_service.store_interaction("a", "I prefer hands-on activities for my students", {"confidence_score": 0.9})
+    memory_service.store_interaction("b", "My students love math games in grade 5", {"confidence_score": 0.9})
+    stats = memory_service.get_memory_stats()
+    assert (stats["total_users"], stats["total_interactions"]) == (2, 2)
+    
+    memory_service.clear_user_memory("a")
+    stats = memory_service.get_memory_stats()
+    assert (stats["total_users"], stats["total_interactions"]) == (1, 1)
+
+
+def test_stats_changes_do_not_leak_between_callers(memory_service, monkeypatch):
+    """Each caller gets its own stats dict, for both mem0 and fallback storage"""
+    memory_service.get_memory_stats()["status"] = "changed"
+    assert memory_service.get_memory_stats()["status"] == "active"
+    
+    # Any truthy client puts the service on the mem0 path
+    monkeypatch.setattr(memory_service, "memory", object())
+    memory_service.get_memory_stats()["status"] = "changed"
+    assert memory_service.get_memory_stats()["status"] == "active"
@@ -0,0 +1,33 @@
+"""
+Tests for the semantic cache
+"""
+
+import numpy as np
+
+from services.semantic_cache import SCORE_BLOCK_ROWS, SemanticCache
+
+
+def _unit_vectors(count, dimensions=32):
+    vectors = np.random.default_rng(0).normal(size=(count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_get_finds_entries_in_every_score_block():
+    """Lookups match the stored vector wherever it falls across the scoring blocks"""
+    vectors = _unit_vectors(SCORE_BLOCK_ROWS * 2 + 5)
+    cache = SemanticCache(vectors.shape[1], threshold=0.9, max_entries=len(vectors))
+    for index, vector in enumerate(vectors):
+        cache.put(vector, index)
+    
+    for index in (0, SCORE_BLOCK_ROWS - 1, SCORE_BLOCK_ROWS, len(vectors) - 1):
+        assert cache.get(vectors[index]) == index
+        assert cache.get(vectors[index].astype(np.float64)) == index
+
+
+def test_get_misses_below_threshold():
+    """A vector orthogonal to everything stored is not a hit"""
+    cache = SemanticCache(4, threshold=0.85)
+    cache.put(np.array([1, 0, 0, 0], dtype=np.float32), "stored")
+    
+    assert cache.get(np.array([0, 1, 0, 0], dtype=np.float32)) is None
+    assert cache.get(np.array([1, 0, 0, 0], dtype=np.float32)) == "stored"